@@ -8,13 +8,17 @@ This will help you test the application without manually adding data.
 """
 
 from app import app, db
-from models import Movie, Show, Seat
+from models import Movie, Show, build_seat_mappings, insert_seats_returning, build_seat_layout
+from sqlalchemy import bindparam
+from itertools import groupby
 from datetime import datetime, timedelta
 
 def add_sample_data():
     """Add sample movies and shows to the database"""
     
-    with app.app_context():
+    # Everything below runs in a single transaction, so the whole
+    # script issues exactly one COMMIT
+    with app.app_context(), db.session.begin():
         # Clear existing data (optional - comment out if you want to keep existing data)
         # db.drop_all()
         # db.create_all()
@@ -70,43 +74,73 @@ def add_sample_data():
             }
         ]
         
-        movies = []
-        for movie_data in movies_data:
-            movie = Movie(**movie_data)
-            db.session.add(movie)
-            movies.append(movie)
-        
-        db.session.commit()
-        print(f"✓ Added {len(movies)} movies")
+        # Insert all movies in one multi-row INSERT and get their IDs back
+        # for the shows below. Every movie gets the same set of shows, so
+        # the IDs don't need to be matched up with movies_data.
+        # (sort_by_parameter_order would make SQLite insert row by row)
+        movie_ids = db.session.scalars(
+            Movie.__table__.insert().returning(Movie.__table__.c.id),
+            movies_data
+        ).all()
+        print(f"✓ Added {len(movie_ids)} movies")
         
         print("Adding sample shows...")
         
         # Add shows for each movie
-        show_times = []
-        base_time = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+        shows_data = []
+        now = datetime.now()
+        base_time = now.replace(hour=10, minute=0, second=0, microsecond=0)
         
         # If current time is past 10 AM, start from tomorrow
-        if base_time < datetime.now():
+        if base_time < now:
             base_time += timedelta(days=1)
         
-        for movie in movies:
+        for movie_id in movie_ids:
             # Add 3 shows per movie on different days
             for day_offset in range(3):
                 for screen in [1, 2]:
                     show_time = base_time + timedelta(days=day_offset, hours=screen * 3)
                     
-                    show = Show(
-                        movie_id=movie.id,
-                        show_time=show_time,
-                        screen_number=screen,
-                        total_seats=50,
-                        price=250.00 + (screen * 50)  # Screen 1: ₹250, Screen 2: ₹300
-                    )
-                    db.session.add(show)
-                    show_times.append(show)
+                    shows_data.append({
+                        'movie_id': movie_id,
+                        'show_time': show_time,
+                        'screen_number': screen,
+                        'total_seats': 50,
+                        'price': 250.00 + (screen * 50)  # Screen 1: ₹250, Screen 2: ₹300
+                    })
+        
+        # Insert all shows in one multi-row INSERT; each returned row
+        # carries its own total_seats, so no matching with shows_data
+        shows = db.session.execute(
+            Show.__table__.insert().returning(
+                Show.__table__.c.id, Show.__table__.c.total_seats
+            ),
+            shows_data
+        ).all()
+        print(f"✓ Added {len(shows)} shows")
+        
+        # Core inserts skip the ORM's after_insert hook, so create the
+        # seats here - all shows' seats in one multi-row INSERT
+        seats_data = []
+        for show in shows:
+            seats_data.extend(build_seat_mappings(show.id, show.total_seats))
+        
+        seats = insert_seats_returning(db.session.connection(), seats_data)
+        print(f"✓ Added {len(seats)} seats")
         
-        db.session.commit()
-        print(f"✓ Added {len(show_times)} shows")
+        # Store each show's seat layout in one executemany UPDATE
+        # groupby needs each show's seats next to each other - they are,
+        # as insert_seats_returning returns them sorted by (show_id, id)
+        shows_table = Show.__table__
+        db.session.execute(
+            shows_table.update()
+            .where(shows_table.c.id == bindparam('b_show_id'))
+            .values(seat_layout=bindparam('b_layout', type_=shows_table.c.seat_layout.type)),
+            [
+                {'b_show_id': show_id, 'b_layout': build_seat_layout(show_seats)}
+                for show_id, show_seats in groupby(seats, key=lambda seat: seat.show_id)
+            ]
+        )
         
         print("\n" + "="*50)
         print("Sample data added successfully!")
@@ -8,6 +8,7 @@ sets up the database, and registers all routes.
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from sqlalchemy import event
 import os
 
 # Initialize Flask application
@@ -19,13 +20,31 @@ app.config['SECRET_KEY'] = 'your-secret-key-change-this-in-production'
 
 # Database configuration
 # SQLite database file will be created in the project directory
+# (DATABASE_URL overrides it, e.g. the tests use an in-memory database)
 basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'movie_booking.db')
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+    'DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'movie_booking.db')
+)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 # Initialize database
 db = SQLAlchemy(app)
 
+# SQLite tuning - applied to every new database connection
+# WAL lets readers and a writer work at the same time, and
+# synchronous=NORMAL avoids a full fsync on every booking commit
+with app.app_context():
+    @event.listens_for(db.engine, 'connect')
+    def _sqlite_pragmas(dbapi_conn, connection_record):
+        """Set performance PRAGMAs on each new SQLite connection"""
+        cursor = dbapi_conn.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA busy_timeout=5000')  # Wait up to 5s for locks
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA cache_size=-64000')  # ~64MB page cache
+        cursor.close()
+
 # Initialize Flask-Login for user session management
 login_manager = LoginManager()
 login_manager.init_app(app)
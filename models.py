@@ -9,12 +9,23 @@ to SQL tables automatically.
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import func, event
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
 
 # Import db from app (will be initialized in app.py)
 # This import happens after db is created, so it's safe
 from app import db
 
+# Password hashing method used for new passwords
+# Pinned explicitly instead of following Werkzeug's default (scrypt in
+# Werkzeug 3.x, which also needs ~32MB of memory per hash). PBKDF2-SHA256
+# is hardware-accelerated on modern CPUs, and 260,000 iterations keeps
+# each login at roughly 50ms of CPU. This is a deliberate security vs.
+# speed tradeoff - raise the iteration count as hardware gets faster.
+# Existing hashes keep working: the method is stored in each hash.
+PASSWORD_HASH_METHOD = 'pbkdf2:sha256:260000'
+
 # UserMixin provides default implementations for Flask-Login
 class User(UserMixin, db.Model):
     """
@@ -36,11 +47,13 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationship: One user can have many bookings
-    bookings = db.relationship('Booking', backref='user', lazy=True)
+    # lazy='raise_on_sql' - queries must load relationships explicitly
+    # (selectinload/joinedload) instead of firing a SELECT on access
+    bookings = db.relationship('Booking', back_populates='user', lazy='raise_on_sql')
     
     def set_password(self, password):
         """Hash and store password securely"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
     
     def check_password(self, password):
         """Verify password against stored hash"""
@@ -76,7 +89,7 @@ class Movie(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationship: One movie can have many shows
-    shows = db.relationship('Show', backref='movie', lazy=True, cascade='all, delete-orphan')
+    shows = db.relationship('Show', back_populates='movie', lazy='raise_on_sql', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Movie {self.title}>'
@@ -93,29 +106,41 @@ class Show(db.Model):
         screen_number: Screen/auditorium number
         total_seats: Total number of seats
         price: Ticket price
+        seat_layout: Seats grouped by row, e.g. {"A": [{"id": 1, "seat_number": "A1", "column": 1}, ...]}
+        movie: Relationship to the movie
         bookings: Relationship to bookings
         seats: Relationship to seats
     """
     __tablename__ = 'shows'
+    __table_args__ = (
+        # Upcoming shows for a movie: WHERE movie_id = ? AND show_time > ?
+        db.Index('ix_show_movie_time', 'movie_id', 'show_time'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), nullable=False)
-    show_time = db.Column(db.DateTime, nullable=False)
+    show_time = db.Column(db.DateTime, nullable=False, index=True)
     screen_number = db.Column(db.Integer, nullable=False)
     total_seats = db.Column(db.Integer, default=50)  # Default 50 seats
     price = db.Column(db.Float, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Seat layout never changes after the show is created, so it's stored
+    # once here instead of being rebuilt from the seats table on every view
+    seat_layout = db.Column(db.JSON)
     
     # Relationships
-    bookings = db.relationship('Booking', backref='show', lazy=True)
-    seats = db.relationship('Seat', backref='show', lazy=True, cascade='all, delete-orphan')
+    movie = db.relationship('Movie', back_populates='shows', lazy='raise_on_sql')
+    bookings = db.relationship('Booking', back_populates='show', lazy='raise_on_sql')
+    seats = db.relationship('Seat', back_populates='show', lazy='raise_on_sql', cascade='all, delete-orphan')
     
     def get_available_seats(self):
         """Get count of available seats for this show"""
-        booked_seats = db.session.query(Seat).join(Booking).filter(
+        # A seat with a booking_id is booked, so there's no need to
+        # join bookings - this is a single COUNT on the seats index
+        booked_seats = db.session.query(func.count(Seat.id)).filter(
             Seat.show_id == self.id,
-            Booking.status == 'confirmed'
-        ).count()
+            Seat.booking_id.isnot(None)
+        ).scalar()
         return self.total_seats - booked_seats
     
     def __repr__(self):
@@ -133,8 +158,20 @@ class Seat(db.Model):
         row: Row letter/number
         column: Column number
         booking_id: Foreign key to Booking (if booked)
+        show: Relationship to the show
+        booking: Relationship to the booking (if booked)
     """
     __tablename__ = 'seats'
+    __table_args__ = (
+        # Covers "booked seats for a show" lookups
+        db.Index('ix_seat_show_booked', 'show_id', 'booking_id'),
+        # Partial index - seats are created unbooked, so bulk seat inserts
+        # don't have to update this index at all
+        db.Index(
+            'ix_seat_booked', 'booking_id',
+            sqlite_where=db.text('booking_id IS NOT NULL')
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     show_id = db.Column(db.Integer, db.ForeignKey('shows.id'), nullable=False)
@@ -143,6 +180,10 @@ class Seat(db.Model):
     column = db.Column(db.Integer, nullable=False)  # Column number
     booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id'), nullable=True)
     
+    # Relationships
+    show = db.relationship('Show', back_populates='seats', lazy='raise_on_sql')
+    booking = db.relationship('Booking', back_populates='seats', lazy='raise_on_sql')
+    
     def is_available(self):
         """Check if seat is available"""
         return self.booking_id is None
@@ -151,6 +192,87 @@ class Seat(db.Model):
         return f'<Seat {self.seat_number}>'
 
 
+SEAT_ROWS = ['A', 'B', 'C', 'D', 'E']  # 5 rows
+
+
+def build_seat_mappings(show_id, total_seats):
+    """
+    Build the seat rows for a show, ready for a bulk INSERT
+    
+    Creates seats in a grid pattern (e.g., A1-A10, B1-B10, etc.)
+    """
+    seats_per_row = total_seats // len(SEAT_ROWS)  # Distribute seats across rows
+    return [
+        {
+            'show_id': show_id,
+            'seat_number': f"{row}{col}",
+            'row': row,
+            'column': col
+        }
+        for row in SEAT_ROWS
+        for col in range(1, seats_per_row + 1)
+    ]
+
+
+def insert_seats_returning(connection, seat_mappings):
+    """
+    Bulk insert seats and return (id, show_id, row, seat_number, column) rows
+    
+    The rows are returned sorted by (show_id, id), i.e. grouped by show
+    and in insert order within each show.
+    """
+    # An empty executemany would run as a single-row INSERT ... DEFAULT
+    # VALUES, so shows with fewer seats than rows just get no seats
+    if not seat_mappings:
+        return []
+    
+    # No sort_by_parameter_order here: on SQLite that would send one
+    # INSERT per seat, while without it all seats go out in a single
+    # multi-row INSERT ... RETURNING. The rows come back in no
+    # particular order, so they're sorted afterwards instead.
+    seats = Seat.__table__
+    rows = connection.execute(
+        seats.insert().returning(
+            seats.c.id, seats.c.show_id, seats.c.row,
+            seats.c.seat_number, seats.c.column
+        ),
+        seat_mappings
+    ).all()
+    return sorted(rows, key=lambda seat: (seat.show_id, seat.id))
+
+
+def build_seat_layout(seats):
+    """Group seat rows into the {row: [seat, ...]} layout stored on Show"""
+    layout = {}
+    for seat in seats:
+        layout.setdefault(seat.row, []).append({
+            'id': seat.id,
+            'seat_number': seat.seat_number,
+            'column': seat.column
+        })
+    return layout
+
+
+@event.listens_for(Show, 'after_insert')
+def create_seats_for_show(mapper, connection, show):
+    """
+    Create the seats for every new show as part of the same flush
+    
+    This way a show always has its seats and seat layout, and the first
+    visitor to the seat selection page doesn't pay for creating them.
+    """
+    seats = insert_seats_returning(
+        connection, build_seat_mappings(show.id, show.total_seats)
+    )
+    layout = build_seat_layout(seats)
+    connection.execute(
+        Show.__table__.update()
+        .where(Show.__table__.c.id == show.id)
+        .values(seat_layout=layout)
+    )
+    set_committed_value(show, 'seat_layout', layout)
+
+
 class Booking(db.Model):
     """
     Booking Model - Stores booking information
@@ -162,19 +284,24 @@ class Booking(db.Model):
         booking_date: When the booking was made
         total_amount: Total price of the booking
         status: Booking status (pending, confirmed, cancelled)
+        user: Relationship to the user who booked
+        show: Relationship to the show
         seats: Relationship to seats
     """
     __tablename__ = 'bookings'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    show_id = db.Column(db.Integer, db.ForeignKey('shows.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    show_id = db.Column(db.Integer, db.ForeignKey('shows.id'), nullable=False, index=True)
     booking_date = db.Column(db.DateTime, default=datetime.utcnow)
     total_amount = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(20), default='confirmed')  # pending, confirmed, cancelled
     
-    # Relationship: One booking can have many seats
-    seats = db.relationship('Seat', backref='booking', lazy=True)
+    # Relationships
+    user = db.relationship('User', back_populates='bookings', lazy='raise_on_sql')
+    show = db.relationship('Show', back_populates='bookings', lazy='raise_on_sql')
+    # One booking can have many seats
+    seats = db.relationship('Seat', back_populates='booking', lazy='raise_on_sql')
     
     def __repr__(self):
         return f'<Booking {self.id} - {self.status}>'
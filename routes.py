@@ -5,19 +5,79 @@ This file contains all the routes (URLs) that users can visit.
 Each function handles a specific page or action.
 """
 
-from flask import render_template, request, redirect, url_for, flash, jsonify, session
+from flask import render_template, request, redirect, url_for, flash, jsonify, session, abort
 from flask_login import login_user, logout_user, login_required, current_user
 from app import app, db
-from models import User, Movie, Show, Booking, Seat
+from models import User, Movie, Show, Booking, Seat, build_seat_mappings, insert_seats_returning, build_seat_layout
 from datetime import datetime, timedelta
-from sqlalchemy import and_
+from functools import lru_cache
+import time
+from sqlalchemy import text, func, select, lambda_stmt, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, joinedload, load_only
+
+# ==================== CACHED QUERIES ====================
+# Queries for the busiest pages, built once as lambda statements.
+# SQLAlchemy caches them by the lambda's code, so each request skips
+# building the statement and computing its cache key; values are
+# passed in as bound parameters at execute time.
+
+# Upcoming shows for a movie
+# "Now" is evaluated by SQLite; show times are stored as local time
+UPCOMING_SHOWS_QUERY = lambda_stmt(lambda: select(Show).where(
+    Show.movie_id == bindparam('movie_id'),
+    Show.show_time > func.datetime('now', 'localtime')
+).order_by(Show.show_time))
+
+# IDs of the booked seats for a show
+BOOKED_SEAT_IDS_QUERY = lambda_stmt(lambda: select(Seat.id).where(
+    Seat.show_id == bindparam('show_id'),
+    Seat.booking_id.isnot(None)
+))
+
+# A user's bookings, newest first, with show, movie title and seats
+# eager loaded so the template doesn't run extra queries per booking
+USER_BOOKINGS_QUERY = lambda_stmt(lambda: select(Booking).options(
+    selectinload(Booking.seats),
+    joinedload(Booking.show).joinedload(Show.movie).load_only(Movie.id, Movie.title)
+).where(
+    Booking.user_id == bindparam('user_id')
+).order_by(Booking.booking_date.desc()))
+
+# Home page movie list, cached per process
+MOVIE_LIST_TTL = 60  # Seconds the home page movie list is cached for
+
+
+@lru_cache(maxsize=1)
+def _movies_cached(bucket):
+    """
+    Helper function to load the home page movie list
+    
+    Cached per process; `bucket` changes every MOVIE_LIST_TTL seconds
+    so the list is reloaded at most once per interval. Returns plain
+    rows (not ORM objects) with only the columns index.html shows,
+    so they stay safe to use after the request's session is closed.
+    """
+    return db.session.execute(
+        select(
+            Movie.id,
+            Movie.title,
+            Movie.genre,
+            Movie.rating,
+            Movie.duration,
+            Movie.poster_url,
+            # The home page only shows the first 100 characters
+            func.substr(Movie.description, 1, 100).label('description')
+        )
+    ).all()
+
 
 # ==================== AUTHENTICATION ROUTES ====================
 
 @app.route('/')
 def index():
     """Home page - Display all movies"""
-    movies = Movie.query.all()
+    movies = _movies_cached(int(time.time()) // MOVIE_LIST_TTL)
     return render_template('index.html', movies=movies)
 
 
@@ -45,22 +105,24 @@ def register():
             flash('Passwords do not match!', 'error')
             return render_template('register.html')
         
-        # Check if user already exists
-        if User.query.filter_by(username=username).first():
-            flash('Username already exists!', 'error')
-            return render_template('register.html')
-        
-        if User.query.filter_by(email=email).first():
-            flash('Email already registered!', 'error')
-            return render_template('register.html')
-        
         # Create new user
         user = User(username=username, email=email)
         user.set_password(password)  # Hash the password
         
         # Save to database
-        db.session.add(user)
-        db.session.commit()
+        # The UNIQUE constraints on username/email decide whether the user
+        # already exists - no separate lookups, and no race between them
+        try:
+            db.session.add(user)
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            # SQLite names the column, e.g. "UNIQUE constraint failed: users.email"
+            if 'users.email' in str(e.orig):
+                flash('Email already registered!', 'error')
+            else:
+                flash('Username already exists!', 'error')
+            return render_template('register.html')
         
         flash('Registration successful! Please login.', 'success')
         return redirect(url_for('login'))
@@ -118,12 +180,9 @@ def movie_detail(movie_id):
     movie = Movie.query.get_or_404(movie_id)
     
     # Get all shows for this movie that are in the future
-    shows = Show.query.filter(
-        and_(
-            Show.movie_id == movie_id,
-            Show.show_time > datetime.now()
-        )
-    ).order_by(Show.show_time).all()
+    shows = db.session.scalars(
+        UPCOMING_SHOWS_QUERY, {'movie_id': movie_id}
+    ).all()
     
     return render_template('movie_detail.html', movie=movie, shows=shows)
 
@@ -136,58 +195,42 @@ def show_seats(show_id):
     
     Display available seats for a show and allow user to select seats
     """
-    show = Show.query.get_or_404(show_id)
+    show = Show.query.options(joinedload(Show.movie)).get_or_404(show_id)
     movie = show.movie
     
-    # Get all seats for this show
-    seats = Seat.query.filter_by(show_id=show_id).all()
-    
-    # If no seats exist, create them
-    if not seats:
-        seats = create_seats_for_show(show)
-    
-    # Organize seats by row for display
-    seats_by_row = {}
-    for seat in seats:
-        if seat.row not in seats_by_row:
-            seats_by_row[seat.row] = []
-        seats_by_row[seat.row].append(seat)
-    
-    # Get booked seat IDs
-    booked_seat_ids = [seat.id for seat in seats if not seat.is_available()]
+    # The seat layout is stored on the show; only the booked seat IDs
+    # change, so those are the only thing read from the seats table
+    booked_seat_ids = set(db.session.scalars(
+        BOOKED_SEAT_IDS_QUERY, {'show_id': show_id}
+    ))
+    
+    seat_layout = show.seat_layout
+    if seat_layout is None:
+        # Show saved without a layout (e.g. inserted outside the ORM, so
+        # the after_insert hook didn't run) - repair it once: create the
+        # seats if it has none, then save the layout so it's bookable
+        app.logger.warning('Show %s has no seat_layout, creating it', show_id)
+        seats = db.session.execute(
+            select(Seat.id, Seat.row, Seat.seat_number, Seat.column)
+            .where(Seat.show_id == show_id)
+            .order_by(Seat.id)
+        ).all()
+        if not seats:
+            seats = insert_seats_returning(
+                db.session.connection(),
+                build_seat_mappings(show.id, show.total_seats)
+            )
+        seat_layout = build_seat_layout(seats)
+        show.seat_layout = seat_layout
+        db.session.commit()
     
     return render_template('show_seats.html', 
                          show=show, 
                          movie=movie, 
-                         seats_by_row=seats_by_row,
+                         seats_by_row=seat_layout,
                          booked_seat_ids=booked_seat_ids)
 
 
-def create_seats_for_show(show):
-    """
-    Helper function to create seats for a show
-    
-    Creates seats in a grid pattern (e.g., A1-A10, B1-B10, etc.)
-    """
-    seats = []
-    rows = ['A', 'B', 'C', 'D', 'E']  # 5 rows
-    seats_per_row = show.total_seats // len(rows)  # Distribute seats across rows
-    
-    for row in rows:
-        for col in range(1, seats_per_row + 1):
-            seat = Seat(
-                show_id=show.id,
-                seat_number=f"{row}{col}",
-                row=row,
-                column=col
-            )
-            seats.append(seat)
-            db.session.add(seat)
-    
-    db.session.commit()
-    return seats
-
-
 @app.route('/book', methods=['POST'])
 @login_required
 def book_tickets():
@@ -198,28 +241,24 @@ def book_tickets():
     """
     data = request.get_json()
     show_id = data.get('show_id')
-    seat_ids = data.get('seat_ids', [])
+    seat_ids = list(set(data.get('seat_ids', [])))  # Ignore duplicate seat IDs
     
     if not show_id or not seat_ids:
         return jsonify({'success': False, 'message': 'Invalid booking data'}), 400
     
-    show = Show.query.get_or_404(show_id)
+    # Only the price is needed from the show, so don't load the whole object
+    price = db.session.execute(
+        select(Show.price).where(Show.id == show_id)
+    ).scalar_one_or_none()
+    if price is None:
+        abort(404)
     
-    # Check if seats are available
-    seats = Seat.query.filter(
-        and_(
-            Seat.show_id == show_id,
-            Seat.id.in_(seat_ids)
-        )
-    ).all()
-    
-    # Verify all seats are available
-    for seat in seats:
-        if not seat.is_available():
-            return jsonify({'success': False, 'message': f'Seat {seat.seat_number} is already booked!'}), 400
+    # Take SQLite's write lock up front, so no other booking can
+    # grab the same seats while this one is being written
+    db.session.execute(text('BEGIN IMMEDIATE'))
     
     # Calculate total amount
-    total_amount = len(seat_ids) * show.price
+    total_amount = len(seat_ids) * price
     
     # Create booking
     booking = Booking(
@@ -231,9 +270,36 @@ def book_tickets():
     db.session.add(booking)
     db.session.flush()  # Get booking ID
     
-    # Assign seats to booking
-    for seat in seats:
-        seat.booking_id = booking.id
+    # Assign all seats in one UPDATE - only seats of this show that
+    # are still free are updated, so a short rowcount means at least
+    # one of them was already booked (or doesn't exist)
+    result = db.session.execute(
+        Seat.__table__.update()
+        .where(Seat.show_id == show_id)
+        .where(Seat.id.in_(seat_ids))
+        .where(Seat.booking_id.is_(None))
+        .values(booking_id=booking.id)
+    )
+    
+    if result.rowcount != len(seat_ids):
+        # Failure path only - find out why before rolling back. Seats
+        # this booking just took have our booking ID, so they don't count.
+        seats = db.session.execute(
+            select(Seat.id, Seat.show_id, Seat.seat_number, Seat.booking_id)
+            .where(Seat.id.in_(seat_ids))
+        ).all()
+        booked = [seat.seat_number for seat in seats
+                  if seat.booking_id is not None and seat.booking_id != booking.id]
+        db.session.rollback()
+        
+        if len(seats) != len(seat_ids) or any(seat.show_id != int(show_id) for seat in seats):
+            return jsonify({'success': False, 'message': 'Invalid seat selection'}), 400
+        
+        if len(booked) == 1:
+            message = f'Seat {booked[0]} is already booked!'
+        else:
+            message = f'Seats {", ".join(booked)} are already booked!'
+        return jsonify({'success': False, 'message': message}), 400
     
     db.session.commit()
     
@@ -248,8 +314,8 @@ def book_tickets():
 @login_required
 def my_bookings():
     """Display all bookings for the current user"""
-    bookings = Booking.query.filter_by(user_id=current_user.id).order_by(
-        Booking.booking_date.desc()
+    bookings = db.session.scalars(
+        USER_BOOKINGS_QUERY, {'user_id': current_user.id}
     ).all()
     
     return render_template('my_bookings.html', bookings=bookings)
@@ -259,7 +325,10 @@ def my_bookings():
 @login_required
 def booking_detail(booking_id):
     """Display details of a specific booking"""
-    booking = Booking.query.get_or_404(booking_id)
+    booking = Booking.query.options(
+        selectinload(Booking.seats),
+        joinedload(Booking.show).joinedload(Show.movie)
+    ).get_or_404(booking_id)
     
     # Verify booking belongs to current user
     if booking.user_id != current_user.id:
@@ -280,9 +349,20 @@ def admin_dashboard():
     Simple admin panel to manage movies and shows
     Note: In production, add proper admin role checking!
     """
-    movies = Movie.query.all()
-    shows = Show.query.order_by(Show.show_time.desc()).limit(10).all()
-    bookings = Booking.query.order_by(Booking.booking_date.desc()).limit(10).all()
+    # Eager load everything the dashboard template touches, and only
+    # the columns it displays (skips large fields like descriptions)
+    movies = Movie.query.options(
+        load_only(Movie.id, Movie.title, Movie.genre, Movie.rating),
+        selectinload(Movie.shows).load_only(Show.id, Show.movie_id)
+    ).all()
+    shows = Show.query.options(
+        load_only(Show.id, Show.show_time, Show.screen_number, Show.price, Show.movie_id),
+        joinedload(Show.movie).load_only(Movie.id, Movie.title)
+    ).order_by(Show.show_time.desc()).limit(10).all()
+    bookings = Booking.query.options(
+        joinedload(Booking.user).load_only(User.id, User.username),
+        joinedload(Booking.show).joinedload(Show.movie).load_only(Movie.id, Movie.title)
+    ).order_by(Booking.booking_date.desc()).limit(10).all()
     
     return render_template('admin/dashboard.html', 
                          movies=movies, 
@@ -305,6 +385,7 @@ def add_movie():
         )
         db.session.add(movie)
         db.session.commit()
+        _movies_cached.cache_clear()  # Show the new movie on the home page
         flash('Movie added successfully!', 'success')
         return redirect(url_for('admin_dashboard'))
     
@@ -324,7 +405,7 @@ def add_show():
             price=float(request.form.get('price'))
         )
         db.session.add(show)
-        db.session.commit()
+        db.session.commit()  # Seats are created by Show's after_insert hook
         flash('Show added successfully!', 'success')
         return redirect(url_for('admin_dashboard'))
     
@@ -0,0 +1,55 @@
+"""
+Test setup - make the application modules importable from the tests folder,
+point the application at an in-memory database, and provide a logged-in
+test client
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Must be set before app.py is imported, so movie_booking.db is never touched
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from datetime import datetime
+
+import pytest
+
+from app import app, db
+from models import User, Movie, Show
+
+
+@pytest.fixture
+def client():
+    """Test client with one logged-in user and two shows with seats"""
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        
+        user = User(username='alice', email='alice@example.com', password_hash='x')
+        movie = Movie(title='Test Movie')
+        db.session.add_all([user, movie])
+        db.session.flush()
+        
+        for screen in [1, 2]:
+            db.session.add(Show(
+                movie_id=movie.id,
+                show_time=datetime(2030, 1, 1, 18, 0),
+                screen_number=screen,
+                total_seats=50,
+                price=250.0
+            ))
+        db.session.commit()
+        user_id = user.id
+    
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user_id)  # Log in through Flask-Login's session key
+    
+    yield client
+    
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
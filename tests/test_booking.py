@@ -0,0 +1,80 @@
+"""
+Tests for the ticket booking endpoint (POST /book)
+
+Uses the application with an in-memory database (see conftest.py
+for the `client` fixture).
+"""
+
+from sqlalchemy import func, select
+
+from app import app, db
+from models import Show, Booking, Seat
+
+
+def seat_ids_for(screen_number, count):
+    """IDs of the first `count` seats of the show on the given screen"""
+    with app.app_context():
+        show_id = db.session.scalar(select(Show.id).where(Show.screen_number == screen_number))
+        seat_ids = db.session.scalars(
+            select(Seat.id).where(Seat.show_id == show_id).order_by(Seat.id).limit(count)
+        ).all()
+    return show_id, seat_ids
+
+
+def book(client, show_id, seat_ids):
+    return client.post('/book', json={'show_id': show_id, 'seat_ids': seat_ids})
+
+
+def booking_count():
+    with app.app_context():
+        return db.session.scalar(select(func.count(Booking.id)))
+
+
+def test_booking_assigns_seats(client):
+    show_id, seat_ids = seat_ids_for(1, 2)
+    
+    response = book(client, show_id, seat_ids)
+    
+    assert response.status_code == 200
+    booking_id = response.get_json()['booking_id']
+    with app.app_context():
+        booked = db.session.scalars(
+            select(Seat.booking_id).where(Seat.id.in_(seat_ids))
+        ).all()
+    assert booked == [booking_id, booking_id]
+
+
+def test_overlapping_booking_is_rejected(client):
+    show_id, seat_ids = seat_ids_for(1, 3)
+    assert book(client, show_id, seat_ids[:2]).status_code == 200
+    
+    response = book(client, show_id, seat_ids[1:])
+    
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Seat A2 is already booked!'
+    assert booking_count() == 1
+    with app.app_context():
+        # The free seat from the failed booking is still free
+        assert db.session.get(Seat, seat_ids[2]).booking_id is None
+
+
+def test_seat_from_another_show_is_rejected(client):
+    show_id, seat_ids = seat_ids_for(1, 1)
+    _, other_seat_ids = seat_ids_for(2, 1)
+    
+    response = book(client, show_id, seat_ids + other_seat_ids)
+    
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Invalid seat selection'
+    assert booking_count() == 0
+
+
+def test_duplicate_seat_ids_are_charged_once(client):
+    show_id, seat_ids = seat_ids_for(1, 1)
+    
+    response = book(client, show_id, seat_ids * 2)
+    
+    assert response.status_code == 200
+    with app.app_context():
+        booking = db.session.get(Booking, response.get_json()['booking_id'])
+        assert booking.total_amount == 250.0
@@ -0,0 +1,85 @@
+"""
+Tests for seat creation when a show is added
+
+Runs against an in-memory SQLite database so the real
+movie_booking.db file is never touched.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from app import db
+from models import Movie, Show, Seat
+
+
+@pytest.fixture
+def engine():
+    """Fresh in-memory database with all tables created"""
+    engine = create_engine('sqlite://')
+    db.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+
+def add_show(session, total_seats):
+    """Add a movie and one show for it, the way the add_show route does"""
+    movie = Movie(title='Test Movie')
+    session.add(movie)
+    session.flush()
+    
+    show = Show(
+        movie_id=movie.id,
+        show_time=datetime(2030, 1, 1, 18, 0),
+        screen_number=1,
+        total_seats=total_seats,
+        price=250.0
+    )
+    session.add(show)
+    session.commit()
+    return show
+
+
+@pytest.mark.parametrize('total_seats', [0, 3])
+def test_show_with_fewer_seats_than_rows_has_no_seats(session, total_seats):
+    show = add_show(session, total_seats)
+    
+    seats = session.scalars(select(Seat).where(Seat.show_id == show.id)).all()
+    assert seats == []
+    assert show.seat_layout == {}
+    
+    # The show itself was saved, with its empty layout
+    session.expire_all()
+    saved = session.get(Show, show.id)
+    assert saved.seat_layout == {}
+
+
+def test_show_seats_are_created_with_layout(session):
+    show = add_show(session, 50)
+    
+    seats = session.scalars(select(Seat).where(Seat.show_id == show.id)).all()
+    assert len(seats) == 50
+    assert list(show.seat_layout) == ['A', 'B', 'C', 'D', 'E']
+    assert [seat['seat_number'] for seat in show.seat_layout['A']][:2] == ['A1', 'A2']
+    assert {seat['id'] for row in show.seat_layout.values() for seat in row} == {seat.id for seat in seats}
+
+
+def test_show_seats_are_inserted_in_one_statement(engine, session):
+    seat_inserts = []
+    
+    @event.listens_for(engine, 'before_cursor_execute')
+    def count_seat_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO seats'):
+            seat_inserts.append(statement)
+    
+    add_show(session, 50)
+    
+    assert len(seat_inserts) == 1
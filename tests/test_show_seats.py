@@ -0,0 +1,31 @@
+"""
+Tests for the seat selection page (GET /show/<id>)
+
+Uses the `client` fixture from conftest.py.
+"""
+
+from sqlalchemy import delete, func, select, update
+
+from app import app, db
+from models import Show, Seat
+
+
+def test_show_without_layout_or_seats_is_repaired(client):
+    # Simulate a show inserted without the after_insert hook
+    with app.app_context():
+        show_id = db.session.scalar(select(Show.id).where(Show.screen_number == 1))
+        db.session.execute(delete(Seat).where(Seat.show_id == show_id))
+        db.session.execute(update(Show).where(Show.id == show_id).values(seat_layout=None))
+        db.session.commit()
+    
+    response = client.get(f'/show/{show_id}')
+    
+    assert response.status_code == 200
+    assert b'data-seat-id=' in response.data
+    with app.app_context():
+        seat_count = db.session.scalar(
+            select(func.count(Seat.id)).where(Seat.show_id == show_id)
+        )
+        layout = db.session.get(Show, show_id).seat_layout
+    assert seat_count == 50
+    assert sum(len(seats) for seats in layout.values()) == 50